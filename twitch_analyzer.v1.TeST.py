@@ -0,0 +1,522 @@
+"""Twitch game analyzer.
+
+Reads a list of game names from my_games.txt, pulls live stream data from
+the Twitch Helix API, scores each game on how approachable it is for a
+small streamer, and shows the results in a sortable table.
+"""
+
+import asyncio
+import os
+import pathlib
+import sqlite3
+import struct
+import threading
+import time
+import tkinter as tk
+from collections import namedtuple
+from dataclasses import dataclass
+from functools import partial
+from operator import attrgetter
+from tkinter import ttk
+
+import numpy as np
+from numba import njit
+from pybloom_live import BloomFilter
+from twitchAPI.twitch import Twitch
+
+APP_ID = os.environ.get("TWITCH_APP_ID", "")
+APP_SECRET = os.environ.get("TWITCH_APP_SECRET", "")
+
+CACHE_DB = "cache.db"
+GAME_LIST_FILE = "my_games.txt"
+STALE_SECONDS = 24 * 60 * 60
+
+# Names Twitch has never resolved; rebuilt weekly so new listings get retried.
+NEGATIVES_FILE = "negatives.bin"
+NEGATIVES_TTL = 7 * 24 * 60 * 60
+
+# Helix accepts up to 100 ids per /streams or /games request.
+CHUNK_SIZE = 100
+
+# Cap on concurrently paginating chunk walks; keeps well under the Helix
+# rate limit (800 requests/min) instead of blasting every chunk at once.
+MAX_CONCURRENT_CHUNKS = 16
+
+@dataclass(slots=True, frozen=True)
+class GameData:
+    name: str
+    viewers: int
+    channels: int
+    engagement_score: float
+    discovery_score: float
+    overall_score: float
+
+# Display strings for one table row, baked once when the GameData is made.
+FormattedRow = namedtuple(
+    "FormattedRow",
+    ["name", "overall", "viewers", "channels", "engagement", "discovery"],
+)
+
+
+def format_row(game_data):
+    """Pre-format a GameData for display so the Tk thread only passes strings."""
+    return FormattedRow(
+        game_data.name,
+        f"{game_data.overall_score:.2f}",
+        f"{game_data.viewers:,}",
+        str(game_data.channels),
+        f"{game_data.engagement_score:.2f}",
+        f"{game_data.discovery_score:.2f}",
+    )
+
+
+@njit(cache=True, fastmath=True)
+def _scores_batch(viewers, channels):
+    """Score every game in one pass over int64 viewer/channel arrays.
+
+    Engagement rewards games whose average channel holds a real audience,
+    discovery rewards games that are not saturated with streamers, and the
+    overall score blends the two. The reciprocal of the channel count is
+    precomputed so the scoring loop is multiply-only and vectorizes.
+    """
+    n = viewers.shape[0]
+    inv_channels = np.where(channels > 0, 1.0 / np.maximum(channels, 1), 0.0)
+    engagement = np.empty(n, np.float64)
+    discovery = np.empty(n, np.float64)
+    overall = np.empty(n, np.float64)
+    for i in range(n):
+        inv = inv_channels[i]
+        e = min(viewers[i] * inv / 10.0, 10.0)
+        d = min(1000.0 * inv, 10.0)
+        engagement[i] = e
+        discovery[i] = d
+        overall[i] = e * 0.6 + d * 0.4
+    return engagement, discovery, overall
+
+
+class GameCache:
+    """Columnar store for cached game rows.
+
+    One row per game spread across parallel NumPy arrays, so the staleness
+    sweep is a single vectorized compare instead of a Python loop over dict
+    entries. ``idx`` maps a casefolded game name to its row in every array,
+    so a lookup with the user's spelling finds the row cached under
+    Twitch's canonical title.
+    """
+
+    __slots__ = ("names", "timestamps", "viewers", "channels",
+                 "engagement", "discovery", "overall", "idx")
+
+    def __init__(self, n):
+        self.names = np.empty(n, dtype=object)
+        self.timestamps = np.zeros(n, dtype=np.float64)
+        self.viewers = np.zeros(n, dtype=np.int64)
+        self.channels = np.zeros(n, dtype=np.int64)
+        self.engagement = np.zeros(n, dtype=np.float64)
+        self.discovery = np.zeros(n, dtype=np.float64)
+        self.overall = np.zeros(n, dtype=np.float64)
+        self.idx = {}
+
+    def row(self, i):
+        return GameData(
+            self.names[i],
+            int(self.viewers[i]),
+            int(self.channels[i]),
+            float(self.engagement[i]),
+            float(self.discovery[i]),
+            float(self.overall[i]),
+        )
+
+
+def open_cache_db():
+    """Open (creating if needed) the game cache database.
+
+    WAL with synchronous=NORMAL keeps upserts cheap and crash-safe without
+    an fsync per statement.
+    """
+    db = sqlite3.connect(CACHE_DB, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS games ("
+        " name TEXT PRIMARY KEY,"
+        " ts REAL,"
+        " viewers INTEGER,"
+        " channels INTEGER,"
+        " engagement REAL,"
+        " discovery REAL,"
+        " overall REAL)"
+    )
+    return db
+
+
+def load_cache(db):
+    """Load the games table into a columnar GameCache."""
+    rows = db.execute(
+        "SELECT name, ts, viewers, channels, engagement, discovery, overall FROM games"
+    ).fetchall()
+    cache = GameCache(len(rows))
+    for i, (name, ts, viewers, channels, engagement, discovery, overall) in enumerate(rows):
+        cache.names[i] = name
+        cache.timestamps[i] = ts
+        cache.viewers[i] = viewers
+        cache.channels[i] = channels
+        cache.engagement[i] = engagement
+        cache.discovery[i] = discovery
+        cache.overall[i] = overall
+        cache.idx[name.casefold()] = i
+    return cache
+
+
+def save_fresh(db, now, game_rows):
+    """Upsert one batch of freshly fetched games in a single transaction."""
+    db.execute("BEGIN IMMEDIATE")
+    db.executemany(
+        "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (gd.name, now, gd.viewers, gd.channels,
+             gd.engagement_score, gd.discovery_score, gd.overall_score)
+            for gd in game_rows
+        ],
+    )
+    db.commit()
+
+
+def load_negatives():
+    """Load the Bloom filter of names Twitch has never resolved.
+
+    The file carries its creation time in an 8-byte header; once it is older
+    than NEGATIVES_TTL a fresh empty filter is returned so games that were
+    listed on Twitch in the meantime get looked up again.
+    """
+    try:
+        with open(NEGATIVES_FILE, "rb") as f:
+            (created,) = struct.unpack("<d", f.read(8))
+            if time.time() - created <= NEGATIVES_TTL:
+                return created, BloomFilter.fromfile(f)
+    except (OSError, struct.error, ValueError):
+        pass
+    return time.time(), BloomFilter(capacity=100000, error_rate=0.001)
+
+
+def save_negatives(created, negatives):
+    tmp = NEGATIVES_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(struct.pack("<d", created))
+        negatives.tofile(f)
+    os.replace(tmp, NEGATIVES_FILE)
+
+
+async def filter_games(twitch, game_list):
+    """Resolve game names to Helix ids, dropping names Twitch does not know.
+
+    Matching is casefolded on both sides so capitalization or width quirks
+    in the user's list ("VALORANT" vs "Valorant") do not silently drop a
+    game, and each name is normalized exactly once.
+    """
+    found = {}
+    for i in range(0, len(game_list), CHUNK_SIZE):
+        chunk = game_list[i : i + CHUNK_SIZE]
+        async for game in twitch.get_games(names=chunk):
+            found[game.name.casefold()] = (game.name, game.id)
+    contains = found.__contains__
+    return [found[k] for k in (name.casefold() for name in game_list) if contains(k)]
+
+
+async def aggregate_chunk(twitch, chunk, sem):
+    """Sum viewer and channel counts for up to 100 games in one stream walk.
+
+    A single /streams query carries every game id in the chunk, so the whole
+    chunk costs one paginated request instead of one per game. ``sem`` bounds
+    how many chunks paginate at once.
+    """
+    # Seed every requested game so a title with zero live streams still
+    # comes back as a (0, 0) row instead of vanishing from the results.
+    counts = {gid: [0, 0] for _, gid in chunk}
+    async with sem:
+        async for stream in twitch.get_streams(game_id=list(counts), first=100):
+            c = counts.get(stream.game_id)
+            if c is not None:
+                c[0] += stream.viewer_count
+                c[1] += 1
+    return counts
+
+
+async def run_analysis(get_twitch, db, post, game_list):
+    """Fetch stream data for every game and post results back to the UI.
+
+    ``post(kind, payload)`` is supplied by the App and marshals each result
+    onto the Tk thread. ``get_twitch`` is awaited only once fresh data is
+    actually needed, so a fully cached run works offline, and a failure to
+    build the client is reported like any other error.
+    """
+    cache = load_cache(db)
+    try:
+        post("status", "Checking cache...")
+        now = time.time()
+        idx = np.array(
+            [cache.idx.get(game.casefold(), -1) for game in game_list], dtype=np.int64
+        )
+        if len(cache.names):
+            stale = (idx < 0) | (
+                (now - cache.timestamps[np.maximum(idx, 0)]) > STALE_SECONDS
+            )
+        else:
+            # Fresh install: no rows to index, everything needs fetching.
+            stale = np.ones(len(game_list), dtype=bool)
+        cached_rows = [cache.row(i) for i in idx[~stale]]
+        post("cached_batch", [(gd, format_row(gd)) for gd in cached_rows])
+        fresh_needed = [game for game, s in zip(game_list, stale) if s]
+
+        if fresh_needed:
+            # Skip names that previously failed to resolve on Twitch; the
+            # Bloom filter makes repeat runs free for typos and delistings.
+            created, negatives = load_negatives()
+            fresh_needed = [game for game in fresh_needed if game not in negatives]
+
+        if fresh_needed:
+            post("status", f"Fetching {len(fresh_needed)} games from Twitch...")
+            twitch = await get_twitch()
+            filtered_games_with_ids = await filter_games(twitch, fresh_needed)
+            id_to_name = {gid: name for name, gid in filtered_games_with_ids}
+
+            resolved = {name.casefold() for name, _ in filtered_games_with_ids}
+            unresolved = [g for g in fresh_needed if g.casefold() not in resolved]
+            if unresolved:
+                for game in unresolved:
+                    negatives.add(game)
+                save_negatives(created, negatives)
+
+            chunks = [
+                filtered_games_with_ids[i : i + CHUNK_SIZE]
+                for i in range(0, len(filtered_games_with_ids), CHUNK_SIZE)
+            ]
+            sem = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+            # The TaskGroup cancels chunk walks still in flight when this
+            # run is cancelled (or one chunk fails), so a superseded run
+            # stops paginating on the shared connector right away.
+            async with asyncio.TaskGroup() as tg:
+                tasks = [
+                    tg.create_task(aggregate_chunk(twitch, chunk, sem))
+                    for chunk in chunks
+                ]
+                # Score and post each chunk as soon as it finishes rather
+                # than waiting for the slowest one.
+                for coro in asyncio.as_completed(tasks):
+                    counts = await coro
+                    entries = [
+                        (id_to_name[game_id], viewers, channels)
+                        for game_id, (viewers, channels) in counts.items()
+                        if game_id in id_to_name
+                    ]
+                    if not entries:
+                        continue
+                    viewers_arr = np.fromiter(
+                        (viewers for _, viewers, _ in entries), np.int64, count=len(entries)
+                    )
+                    channels_arr = np.fromiter(
+                        (channels for _, _, channels in entries), np.int64, count=len(entries)
+                    )
+                    engagement, discovery, overall = _scores_batch(viewers_arr, channels_arr)
+                    batch = [
+                        GameData(name, viewers, channels, engagement[i], discovery[i], overall[i])
+                        for i, (name, viewers, channels) in enumerate(entries)
+                    ]
+                    for game_data in batch:
+                        post("fresh", (game_data, format_row(game_data)))
+                    save_fresh(db, now, batch)
+    except asyncio.CancelledError:
+        # A re-click cancelled this run; the replacement run owns the UI now,
+        # so no completion post.
+        raise
+    except Exception as e:
+        post("status", f"Error: {e}")
+        post("complete", None)
+    else:
+        post("complete", None)
+
+
+class App(tk.Tk):
+    COLUMNS = ("Rank", "Game", "Overall", "Viewers", "Channels", "Engagement", "Discovery")
+
+    # Treeview column -> GameData attribute used when sorting.
+    SORT_KEYS = {
+        "Game": "name",
+        "Overall": "overall_score",
+        "Viewers": "viewers",
+        "Channels": "channels",
+        "Engagement": "engagement_score",
+        "Discovery": "discovery_score",
+    }
+
+    # C-implemented key functions, built once instead of a lambda per click.
+    _KEY_GETTERS = {key: attrgetter(key) for key in SORT_KEYS.values()}
+
+    def __init__(self):
+        super().__init__()
+        self.title("Twitch Game Analyzer")
+        self.geometry("900x600")
+
+        self.game_data_list = []
+        self._iid_by_name = {}
+        self._pending = []
+        self._flush_scheduled = False
+        self.reverse_sort = True
+        self._last_sort_key = None
+        # Bumped per run; _dispatch drops payloads from superseded runs.
+        self._run_gen = 0
+
+        # One event loop for the App lifetime: the Twitch client and its
+        # OAuth token survive between runs.
+        self._loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self.thread.start()
+        self._twitch = None
+        self._analysis_fut = None
+        # Opened once; run_analysis reads and upserts on the worker loop.
+        self._db = open_cache_db()
+
+        self.run_button = ttk.Button(self, text="Run Analysis", command=self.start_analysis_thread)
+        self.run_button.pack(pady=5)
+
+        self.status_label = ttk.Label(self, text="Ready")
+        self.status_label.pack()
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show="headings")
+        for col in self.COLUMNS:
+            self.tree.heading(
+                col, text=col, command=lambda c=col: self.treeview_sort_column(c)
+            )
+            self.tree.column(col, width=110, anchor="center")
+        self.tree.column("Game", width=220, anchor="w")
+        self.tree.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def read_game_list(self):
+        try:
+            text = pathlib.Path(GAME_LIST_FILE).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            self.update_status(f"{GAME_LIST_FILE} not found")
+            return []
+        # De-duplicate by casefolded name (matching how games are resolved
+        # and cached) while keeping first-seen order and spelling, so
+        # "Valorant" and "VALORANT" cost one lookup and one table row.
+        unique = {}
+        for line in text.splitlines():
+            name = line.strip()
+            if name:
+                unique.setdefault(name.casefold(), name)
+        return list(unique.values())
+
+    async def _ensure_twitch(self):
+        """Create the Twitch client once; later runs reuse its OAuth token."""
+        if self._twitch is None:
+            self._twitch = await Twitch(APP_ID, APP_SECRET)
+        return self._twitch
+
+    async def _run_analysis(self, game_list, gen):
+        await run_analysis(
+            self._ensure_twitch, self._db, partial(self._post, gen), game_list
+        )
+
+    def _post(self, gen, kind, payload):
+        """Hand one worker result to the Tk thread via its event queue.
+
+        after_idle runs _dispatch at idle priority, so pending user input is
+        serviced first and results still arrive without any polling timer.
+        ``gen`` identifies the run that produced the result.
+        """
+        self.after_idle(self._dispatch, gen, kind, payload)
+
+    def _dispatch(self, gen, kind, payload):
+        if gen != self._run_gen:
+            # A cancelled run keeps posting until it hits its next await
+            # point; don't let its stragglers leak into the current run.
+            return
+        if kind == "status":
+            self.update_status(payload)
+        elif kind == "cached_batch":
+            for game_data, row in payload:
+                self.game_data_list.append(game_data)
+                self._pending.append(row)
+            self._schedule_flush()
+        elif kind == "fresh":
+            game_data, row = payload
+            self.game_data_list.append(game_data)
+            self._pending.append(row)
+            self._schedule_flush()
+        elif kind == "complete":
+            self.update_status(f"Done - {len(self.game_data_list)} games")
+
+    def start_analysis_thread(self):
+        game_list = self.read_game_list()
+        if not game_list:
+            return
+        if self._analysis_fut is not None and not self._analysis_fut.done():
+            # Re-clicking cancels the in-flight run and starts over.
+            self._analysis_fut.cancel()
+        self._run_gen += 1
+        self.clear_table()
+        self.game_data_list = []
+        self.update_status("Running...")
+        self._analysis_fut = asyncio.run_coroutine_threadsafe(
+            self._run_analysis(game_list, self._run_gen), self._loop
+        )
+
+    def update_status(self, message):
+        self.status_label.configure(text=message)
+
+    def _schedule_flush(self):
+        """Coalesce row inserts so a burst of results redraws the tree once."""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.after_idle(self._flush_pending)
+
+    def _flush_pending(self):
+        pending, self._pending = self._pending, []
+        self._flush_scheduled = False
+        for row in pending:
+            self.populate_table_row(row)
+
+    def populate_table_row(self, row):
+        rank = len(self.tree.get_children()) + 1
+        # Straight to Tcl: skips tkinter's per-call option parsing, which
+        # matters when a whole run's rows are flushed in one burst.
+        iid = self.tree.tk.call(
+            self.tree._w, "insert", "", "end", "-values", (rank, *row)
+        )
+        self._iid_by_name[row.name] = iid
+
+    def clear_table(self):
+        for iid in self.tree.get_children():
+            self.tree.delete(iid)
+        self._iid_by_name = {}
+        self._pending = []
+        self._last_sort_key = None
+
+    def treeview_sort_column(self, column):
+        key = self.SORT_KEYS.get(column)
+        if key is None:
+            return
+        # A header click can beat the idle-time flush, leaving rows in
+        # game_data_list with no Treeview iid yet; insert them first.
+        if self._pending:
+            self._flush_pending()
+        if key == self._last_sort_key:
+            # Same column again: flipping direction only needs an O(N)
+            # reverse, not a fresh O(N log N) sort.
+            self.game_data_list.reverse()
+            self.reverse_sort = not self.reverse_sort
+        else:
+            self.reverse_sort = True
+            self.game_data_list.sort(key=self._KEY_GETTERS[key], reverse=True)
+            self._last_sort_key = key
+        # Reorder the existing rows in place; only the Rank cell changes,
+        # so there is no need to rebuild every row from scratch.
+        for rank, game_data in enumerate(self.game_data_list):
+            iid = self._iid_by_name[game_data.name]
+            self.tree.move(iid, "", rank)
+            self.tree.set(iid, "Rank", rank + 1)
+
+
+if __name__ == "__main__":
+    App().mainloop()